@@ -2,11 +2,42 @@
 import numpy as np
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import trimesh
 import logging
 from typing import List, Dict, Tuple
 import base64
-import io
+import concurrent.futures
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from stl_parser import parse_stl
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from flask_compress import Compress
+    HAS_COMPRESS = True
+except ImportError:
+    HAS_COMPRESS = False
+
+try:
+    import numba
+    from numba import njit, prange
+    # Kernels are called from concurrent request threads, which the
+    # workqueue layer aborts the process on; require TBB or OpenMP
+    numba.config.THREADING_LAYER = 'threadsafe'
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,6 +45,182 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+if HAS_COMPRESS:
+    # Gzip the large region index payloads; small responses aren't worth it
+    app.config['COMPRESS_MIN_SIZE'] = 4096
+    Compress(app)
+
+def _json_default(obj):
+    """Serialize NumPy arrays and scalars for the stdlib json fallback"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _json_response(obj):
+    """
+    JSON response for payloads carrying NumPy index arrays
+    
+    Uses orjson, which writes NumPy arrays natively, when it is installed.
+    """
+    if HAS_ORJSON:
+        body = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        body = json.dumps(obj, default=_json_default)
+    return app.response_class(body, mimetype='application/json')
+
+def _indices_payload(indices: np.ndarray, indices_format: str) -> Dict:
+    """
+    Region vertex index fields in the requested wire format
+    
+    'base64' sends the indices as little-endian int32 bytes, which is smaller
+    than a JSON list and much faster to encode and parse.
+    """
+    if indices_format == 'base64':
+        return {
+            'vertex_indices_b64': base64.b64encode(indices.astype('<i4', copy=False).tobytes()).decode('ascii'),
+            'vertex_indices_dtype': 'int32',
+            'vertex_indices_count': len(indices)
+        }
+    return {'vertex_indices': indices}
+
+# Number of parsed STL meshes kept for repeated uploads
+MESH_CACHE_SIZE = 32
+# Wire formats for region vertex indices
+INDICES_FORMATS = ('list', 'base64')
+# Seconds to wait for a worker process to parse an STL file
+STL_PARSE_TIMEOUT = 120
+
+def _column(vertices: np.ndarray, axis: int) -> np.ndarray:
+    """Copy one axis of an Nx3 vertex array into a contiguous float32 array"""
+    return np.ascontiguousarray(vertices[:, axis], dtype=np.float32)
+
+def _bin_tables(region_definitions: Dict) -> Tuple[np.ndarray, Tuple[str, ...], np.ndarray]:
+    """Classification tables for a set of region definitions (see _build_bin_tables)"""
+    key = tuple(
+        (name, tuple(definition['height_range']), definition.get('radial_threshold'))
+        for name, definition in region_definitions.items()
+    )
+    return _build_bin_tables(key)
+
+@lru_cache(maxsize=32)
+def _build_bin_tables(regions: Tuple) -> Tuple[np.ndarray, Tuple[str, ...], np.ndarray]:
+    """
+    Precompute the classification tables from (name, height_range, radial_threshold) tuples
+    
+    Regions without a radial_threshold are stacked by height and become
+    bins for np.digitize; each one extends up to the next region's range.
+    Regions with a radial_threshold (e.g. arms) are applied afterwards and
+    claim the outer vertices within their height range.
+    
+    Returns:
+        Height bin edges, region name per bin, and one row per radial region:
+        (bin index, low height, high height, radial threshold)
+    """
+    height_regions = sorted(
+        (region for region in regions if region[2] is None),
+        key=lambda region: region[1][0]
+    )
+    radial_regions = [region for region in regions if region[2] is not None]
+    
+    height_edges = np.array(
+        [height_range[1] for _, height_range, _ in height_regions[:-1]],
+        dtype=np.float32
+    )
+    bin_names = tuple(name for name, _, _ in height_regions + radial_regions)
+    radial_bins = np.array(
+        [
+            (len(height_regions) + i, *height_range, radial_threshold)
+            for i, (_, height_range, radial_threshold) in enumerate(radial_regions)
+        ],
+        dtype=np.float32
+    ).reshape(-1, 4)
+    
+    return height_edges, bin_names, radial_bins
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _classify_kernel(heights, radial, height_edges, radial_bins, out):
+        """Fused per-vertex classifier matching the np.digitize + radial mask path"""
+        for i in prange(heights.shape[0]):
+            h = heights[i]
+            b = 0
+            # "not h < edge" rather than "h >= edge" so NaN lands in the last
+            # bin, as with np.digitize
+            while b < height_edges.shape[0] and not h < height_edges[b]:
+                b += 1
+            for j in range(radial_bins.shape[0]):
+                if radial_bins[j, 1] < h < radial_bins[j, 2] and radial[i] > radial_bins[j, 3]:
+                    b = int(radial_bins[j, 0])
+            out[i] = b
+    
+    # Compile (or load from cache) at import rather than on the first request
+    try:
+        _classify_kernel(
+            np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.float32),
+            np.zeros(1, dtype=np.float32), np.zeros((1, 4), dtype=np.float32),
+            np.empty(1, dtype=np.int8)
+        )
+    except ValueError as e:
+        # No thread-safe threading layer installed
+        logger.warning(f"Numba disabled, using NumPy classifier: {e}")
+        HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _group_kernel(bins, offsets, out):
+        """Scatter vertex indices into their bin's slice of out, in index order"""
+        write_ptrs = offsets.copy()
+        for i in range(bins.shape[0]):
+            b = bins[i]
+            out[write_ptrs[b]] = i
+            write_ptrs[b] += 1
+    
+    _group_kernel(np.zeros(1, dtype=np.int8), np.zeros(1, dtype=np.int64), np.empty(1, dtype=np.int32))
+
+def _group_by_bin(bins: np.ndarray, counts: np.ndarray) -> List[np.ndarray]:
+    """Split vertex indices by bin into ascending int32 arrays (views of one buffer)"""
+    offsets = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=offsets[1:])
+    if HAS_NUMBA:
+        grouped = np.empty(len(bins), dtype=np.int32)
+        _group_kernel(bins, offsets, grouped)
+    else:
+        grouped = np.argsort(bins, kind='stable').astype(np.int32)
+    return np.split(grouped, offsets[1:])
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Create the STL parsing process pool on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawn rather than fork: forking after Numba has started its
+            # thread pool can deadlock the child
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+def _discard_pool(pool: concurrent.futures.ProcessPoolExecutor, terminate: bool = False):
+    """
+    Drop a broken or stuck pool so the next _get_pool() starts a fresh one
+    
+    Args:
+        pool: The pool to discard
+        terminate: Kill its workers too; a running parse cannot be cancelled
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    if terminate:
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
 class MiniatureSegmenter:
     """Simple geometric segmentation that actually works"""
     
@@ -46,81 +253,170 @@ class MiniatureSegmenter:
                 'description': 'Head, helmet and accessories'
             }
         }
+        
+        # Recently parsed STL files, keyed by SHA-256 of their bytes
+        self._mesh_cache = OrderedDict()
+        self._mesh_cache_lock = threading.Lock()
     
-    def segment_mesh(self, vertices: np.ndarray) -> Dict[str, List[int]]:
+    def classify_vertices(
+        self, vertices: np.ndarray, region_definitions: Dict = None,
+        bounds: np.ndarray = None
+    ) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
         """
-        Segment mesh vertices into painting regions using simple geometry
+        Assign every vertex to a painting region using simple geometry
         
         Args:
             vertices: Nx3 array of vertex positions
+            region_definitions: Regions to segment into, defaults to
+                self.region_definitions
+            bounds: Optional 2x3 [min, max] bounding box of vertices, saves
+                recomputing it
             
         Returns:
-            Dictionary mapping region names to vertex indices
+            Region name per bin, per-vertex bin indices, and the vertex
+            count of each bin
         """
+        if region_definitions is None:
+            region_definitions = self.region_definitions
+        height_edges, bin_names, radial_bins = _bin_tables(region_definitions)
+        
+        n_bins = len(bin_names)
+        # Numba kernels are compiled for int8 bins; keep every branch on that dtype
+        bin_dtype = np.int8 if HAS_NUMBA else np.intp
         if len(vertices) == 0:
-            return {}
+            return bin_names, np.zeros(0, dtype=bin_dtype), np.zeros(n_bins, dtype=np.intp)
+        
+        # Work on contiguous per-axis columns rather than the Nx3 array
+        ys = _column(vertices, 1)
         
         # Calculate bounding box and normalize heights
-        min_coords = np.min(vertices, axis=0)
-        max_coords = np.max(vertices, axis=0)
-        height_range = max_coords[1] - min_coords[1]
+        if bounds is not None:
+            bounds = np.asarray(bounds, dtype=np.float32)
+            min_y, max_y = bounds[0][1], bounds[1][1]
+        else:
+            min_y, max_y = ys.min(), ys.max()
+        height_range = max_y - min_y
         
         if height_range == 0:
-            # Flat object - all vertices go to base
-            return {'base': list(range(len(vertices)))}
+            # Flat object - all vertices go to the lowest region
+            bins = np.zeros(len(vertices), dtype=bin_dtype)
+        else:
+            # Normalize vertex heights to 0-1 range
+            normalized_heights = (ys - min_y) * (1.0 / height_range)
+            
+            # Calculate radial distances from center (for arm detection),
+            # unless no region uses them
+            if len(radial_bins):
+                xs, zs = _column(vertices, 0), _column(vertices, 2)
+                if bounds is not None:
+                    center_x = (bounds[0][0] + bounds[1][0]) / 2
+                    center_z = (bounds[0][2] + bounds[1][2]) / 2
+                else:
+                    center_x = (xs.min() + xs.max()) / 2
+                    center_z = (zs.min() + zs.max()) / 2
+                normalized_radial = np.hypot(xs - center_x, zs - center_z)
+                max_radial = normalized_radial.max()
+                if max_radial > 0:
+                    normalized_radial /= max_radial
+            else:
+                # Never read by the classifier
+                normalized_radial = np.empty(0, dtype=np.float32)
+            
+            # Assign vertices to regions
+            if HAS_NUMBA:
+                bins = np.empty(len(vertices), dtype=bin_dtype)
+                _classify_kernel(
+                    normalized_heights, normalized_radial,
+                    height_edges, radial_bins, bins
+                )
+            else:
+                # One height bin per vertex
+                bins = np.digitize(normalized_heights, height_edges)
+                # Radial regions claim the outer vertices of their height range
+                for region_id, low, high, threshold in radial_bins:
+                    radial_mask = (
+                        (normalized_heights > low) & (normalized_heights < high) &
+                        (normalized_radial > threshold)
+                    )
+                    bins[radial_mask] = int(region_id)
         
-        # Normalize vertex heights to 0-1 range
-        normalized_heights = (vertices[:, 1] - min_coords[1]) / height_range
+        counts = np.bincount(bins, minlength=n_bins)
         
-        # Calculate radial distances from center (for arm detection)
-        center_x = (min_coords[0] + max_coords[0]) / 2
-        center_z = (min_coords[2] + max_coords[2]) / 2
-        radial_distances = np.sqrt(
-            (vertices[:, 0] - center_x) ** 2 + 
-            (vertices[:, 2] - center_z) ** 2
-        )
-        max_radial = np.max(radial_distances)
-        if max_radial > 0:
-            normalized_radial = radial_distances / max_radial
-        else:
-            normalized_radial = np.zeros_like(radial_distances)
+        logger.info(f"Segmentation complete: {len(vertices)} vertices into {np.count_nonzero(counts)} regions")
+        for name, count in zip(bin_names, counts):
+            if count > 0:
+                logger.info(f"  {name}: {count} vertices ({count/len(vertices)*100:.1f}%)")
         
-        # Assign vertices to regions
-        regions = {name: [] for name in self.region_definitions.keys()}
+        return bin_names, bins, counts
+    
+    def segment_mesh(
+        self, vertices: np.ndarray, region_definitions: Dict = None,
+        bounds: np.ndarray = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Segment mesh vertices into painting regions using simple geometry
         
-        for i, (height, radial) in enumerate(zip(normalized_heights, normalized_radial)):
-            assigned = False
+        Args:
+            vertices: Nx3 array of vertex positions
+            region_definitions: Regions to segment into, defaults to
+                self.region_definitions
+            bounds: Optional 2x3 [min, max] bounding box of vertices
             
-            # Check each region's criteria
-            if height < 0.05:
-                regions['base'].append(i)
-                assigned = True
-            elif height < 0.35:
-                regions['legs'].append(i)
-                assigned = True
-            elif height < 0.65:
-                # Check if it's an arm (outer position)
-                if radial > 0.4 and height > 0.4:
-                    regions['arms'].append(i)
-                else:
-                    regions['torso'].append(i)
-                assigned = True
-            elif height < 0.85:
-                regions['head'].append(i)
-                assigned = True
+        Returns:
+            Dictionary mapping region names to int32 arrays of vertex indices
+        """
+        if len(vertices) == 0:
+            return {}
+        
+        bin_names, bins, counts = self.classify_vertices(vertices, region_definitions, bounds)
+        
+        # Group indices by region, leaving out empty regions
+        return {
+            name: indices
+            for name, count, indices in zip(bin_names, counts, _group_by_bin(bins, counts))
+            if count > 0
+        }
+    
+    def _load_mesh(self, file_data: bytes) -> Dict:
+        """
+        Load an STL file, reusing the parsed mesh if the same bytes were seen recently
+        
+        Args:
+            file_data: Binary STL file data
             
-            # Fallback to torso if not assigned
-            if not assigned:
-                regions['torso'].append(i)
+        Returns:
+            Float32 vertex array and mesh statistics
+        """
+        key = hashlib.sha256(file_data).digest()
+        with self._mesh_cache_lock:
+            if key in self._mesh_cache:
+                self._mesh_cache.move_to_end(key)
+                return self._mesh_cache[key]
         
-        # Remove empty regions
-        regions = {k: v for k, v in regions.items() if len(v) > 0}
+        # Parse in a worker process so large files don't hold the GIL. A
+        # dead worker (e.g. OOM-killed) breaks the whole pool, so replace it
+        # and try once more on a fresh one.
+        for attempt in range(2):
+            pool = _get_pool()
+            try:
+                mesh_data = pool.submit(parse_stl, file_data).result(timeout=STL_PARSE_TIMEOUT)
+                break
+            except concurrent.futures.TimeoutError:
+                # Free the stuck worker; parses running in other workers fail
+                # with BrokenProcessPool and retry on the new pool
+                _discard_pool(pool, terminate=True)
+                raise TimeoutError(f"STL parsing did not finish within {STL_PARSE_TIMEOUT} seconds")
+            except BrokenProcessPool:
+                _discard_pool(pool)
+                if attempt:
+                    raise RuntimeError("STL parser process terminated abruptly")
         
-        logger.info(f"Segmentation complete: {len(vertices)} vertices into {len(regions)} regions")
-        for name, indices in regions.items():
-            logger.info(f"  {name}: {len(indices)} vertices ({len(indices)/len(vertices)*100:.1f}%)")
+        with self._mesh_cache_lock:
+            self._mesh_cache[key] = mesh_data
+            while len(self._mesh_cache) > MESH_CACHE_SIZE:
+                self._mesh_cache.popitem(last=False)
         
-        return regions
+        return mesh_data
     
     def analyze_stl_file(self, file_data: bytes) -> Dict:
         """
@@ -133,49 +429,34 @@ class MiniatureSegmenter:
             Analysis results with regions and statistics
         """
         try:
-            # Load mesh using trimesh
-            mesh = trimesh.load(io.BytesIO(file_data), file_type='stl')
-            
-            # Get vertices (unique points)
-            vertices = mesh.vertices
+            mesh_data = self._load_mesh(file_data)
+            vertices = mesh_data['vertices']
             
             # Perform segmentation
-            regions = self.segment_mesh(vertices)
+            bin_names, bins, counts = self.classify_vertices(vertices, bounds=mesh_data['bounds'])
             
-            # Calculate mesh statistics
-            bounds = mesh.bounds
-            volume = mesh.volume if mesh.is_volume else 0
+            n = len(vertices)
             
-            # Format response
-            result = {
+            # Format response, with region information for non-empty regions
+            return {
                 'success': True,
-                'mesh_info': {
-                    'vertices': len(vertices),
-                    'faces': len(mesh.faces),
-                    'volume': float(volume),
-                    'bounds': {
-                        'min': bounds[0].tolist(),
-                        'max': bounds[1].tolist()
+                'mesh_info': dict(mesh_data['mesh_info']),
+                'regions': [
+                    {
+                        'id': name,
+                        'name': name.title(),
+                        'description': self.region_definitions.get(name, {}).get('description', ''),
+                        'color': self.region_definitions.get(name, {}).get('color', '#808080'),
+                        'vertex_count': indices.size,
+                        'vertex_percentage': indices.size / n * 100,
+                        # Send sample for preview
+                        'vertex_indices': indices[:100]
                     }
-                },
-                'regions': []
+                    for name, indices in zip(bin_names, _group_by_bin(bins, counts))
+                    if indices.size > 0
+                ]
             }
             
-            # Add region information
-            for name, indices in regions.items():
-                region_info = self.region_definitions.get(name, {})
-                result['regions'].append({
-                    'id': name,
-                    'name': name.title(),
-                    'description': region_info.get('description', ''),
-                    'color': region_info.get('color', '#808080'),
-                    'vertex_count': len(indices),
-                    'vertex_percentage': len(indices) / len(vertices) * 100,
-                    'vertex_indices': indices[:100]  # Send sample for preview
-                })
-            
-            return result
-            
         except Exception as e:
             logger.error(f"Error analyzing STL: {e}")
             return {
@@ -204,18 +485,33 @@ def segment_model():
         - stl_file: Base64 encoded STL file
         or
         - vertices: Array of vertex coordinates
+        - indices_format: 'list' (default) or 'base64' for the vertices
+          response's region indices
     """
     try:
         data = request.get_json()
+        indices_format = data.get('indices_format', 'list')  # list, base64
+        if indices_format not in INDICES_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported indices format: {indices_format}'
+            }), 400
         
         if 'stl_file' in data:
-            # Decode base64 STL file
-            stl_data = base64.b64decode(data['stl_file'].split(',')[1] if ',' in data['stl_file'] else data['stl_file'])
+            # Decode base64 STL file, dropping any data URL prefix
+            stl_file = data['stl_file']
+            prefix, comma, payload = stl_file.partition(',')
+            stl_data = base64.b64decode(payload if comma else prefix)
             result = segmenter.analyze_stl_file(stl_data)
             
         elif 'vertices' in data:
             # Direct vertex array
-            vertices = np.array(data['vertices'])
+            vertices = np.asarray(data['vertices'], dtype=np.float32)
+            if not np.isfinite(vertices).all():
+                return jsonify({
+                    'success': False,
+                    'error': 'Vertex coordinates must be finite numbers'
+                }), 400
             regions = segmenter.segment_mesh(vertices)
             
             result = {
@@ -230,7 +526,7 @@ def segment_model():
                     'name': name.title(),
                     'color': region_info.get('color', '#808080'),
                     'vertex_count': len(indices),
-                    'vertex_indices': indices
+                    **_indices_payload(indices, indices_format)
                 })
         else:
             return jsonify({
@@ -238,7 +534,7 @@ def segment_model():
                 'error': 'No model data provided'
             }), 400
         
-        return jsonify(result)
+        return _json_response(result)
         
     except Exception as e:
         logger.error(f"Segmentation error: {e}")
@@ -247,6 +543,34 @@ def segment_model():
             'error': str(e)
         }), 500
 
+@app.route('/segment-file', methods=['POST'])
+def segment_file():
+    """
+    Segment an STL file uploaded as multipart/form-data
+    
+    Expects:
+        - stl_file: Binary STL file part
+    
+    Skips the base64 round trip of /segment for large models.
+    """
+    try:
+        stl_file = request.files.get('stl_file')
+        if stl_file is None:
+            return jsonify({
+                'success': False,
+                'error': 'No STL file provided'
+            }), 400
+        
+        result = segmenter.analyze_stl_file(stl_file.read())
+        return _json_response(result)
+        
+    except Exception as e:
+        logger.error(f"File segmentation error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/segment-advanced', methods=['POST'])
 def segment_with_options():
     """
@@ -258,18 +582,25 @@ def segment_with_options():
         # Get custom parameters
         miniature_type = data.get('type', 'humanoid')  # humanoid, creature, vehicle
         detail_level = data.get('detail_level', 'medium')  # low, medium, high
+        indices_format = data.get('indices_format', 'list')  # list, base64
+        if indices_format not in INDICES_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported indices format: {indices_format}'
+            }), 400
         
         # Adjust segmentation based on type
+        region_definitions = None
         if miniature_type == 'creature':
             # Simpler segmentation for creatures
-            segmenter.region_definitions = {
+            region_definitions = {
                 'base': {'height_range': (0.0, 0.1), 'color': '#8B4513'},
                 'body': {'height_range': (0.1, 0.7), 'color': '#D2691E'},
                 'head': {'height_range': (0.7, 1.0), 'color': '#F5DEB3'}
             }
         elif miniature_type == 'vehicle':
             # Different regions for vehicles
-            segmenter.region_definitions = {
+            region_definitions = {
                 'chassis': {'height_range': (0.0, 0.3), 'color': '#2F4F4F'},
                 'hull': {'height_range': (0.3, 0.7), 'color': '#708090'},
                 'turret': {'height_range': (0.7, 1.0), 'color': '#696969'}
@@ -277,17 +608,22 @@ def segment_with_options():
         
         # Process the model
         if 'vertices' in data:
-            vertices = np.array(data['vertices'])
-            regions = segmenter.segment_mesh(vertices)
+            vertices = np.asarray(data['vertices'], dtype=np.float32)
+            if not np.isfinite(vertices).all():
+                return jsonify({
+                    'success': False,
+                    'error': 'Vertex coordinates must be finite numbers'
+                }), 400
+            regions = segmenter.segment_mesh(vertices, region_definitions)
             
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'type': miniature_type,
                 'regions': [
                     {
                         'id': name,
                         'name': name.title(),
-                        'vertex_indices': indices,
+                        **_indices_payload(indices, indices_format),
                         'vertex_count': len(indices)
                     }
                     for name, indices in regions.items()
@@ -351,13 +687,7 @@ def export_regions():
         }), 500
 
 if __name__ == '__main__':
-    print("🎨 Miniature Painter Backend - Geometric Segmentation")
-    print("=" * 50)
-    print("✅ Simple, working segmentation without SAM complexity")
-    print("✅ 5-8 meaningful regions for painting")
-    print("✅ Height-based and radial detection")
-    print("✅ No impossible pixel-to-vertex mapping")
-    print("=" * 50)
-    print("Server running on http://localhost:5000")
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Spawned STL parser workers re-run the launching script, so serve from
+    # server.py, whose workers never import this module
+    server = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+    os.execv(sys.executable, [sys.executable, server] + sys.argv[1:])
@@ -0,0 +1,22 @@
+# server.py - Entry point for the miniature painter backend
+#
+# The STL parser pool spawns its workers, and spawned workers re-run the
+# launching script. Keeping the app import inside main() means they only
+# load stl_parser, not Flask, Numba or the segmenter.
+
+def main():
+    from backend import app
+    
+    print("🎨 Miniature Painter Backend - Geometric Segmentation")
+    print("=" * 50)
+    print("✅ Simple, working segmentation without SAM complexity")
+    print("✅ 5-8 meaningful regions for painting")
+    print("✅ Height-based and radial detection")
+    print("✅ No impossible pixel-to-vertex mapping")
+    print("=" * 50)
+    print("Server running on http://localhost:5000")
+    
+    app.run(debug=True, host='0.0.0.0', port=5000)
+
+if __name__ == '__main__':
+    main()
@@ -35,14 +35,14 @@ if [ ! -d "venv" ]; then
     echo "📦 Setting up Python environment..."
     python3 -m venv venv
     source venv/bin/activate
-    pip install flask flask-cors trimesh numpy
+    pip install -r requirements.txt
 else
     source venv/bin/activate
 fi
 
 # Start backend
 echo "🔧 Starting backend server..."
-python backend.py &
+python server.py &
 BACKEND_PID=$!
 
 # Wait for backend to start
@@ -0,0 +1,34 @@
+# stl_parser.py - STL loading for the backend's parser process pool
+#
+# Kept separate from backend.py so pool workers only import what parsing
+# needs, not Flask or Numba.
+import numpy as np
+import trimesh
+from typing import Dict
+import io
+
+def parse_stl(file_data: bytes) -> Dict:
+    """Parse STL bytes into float32 vertices and mesh statistics"""
+    # Load mesh using trimesh
+    mesh = trimesh.load(io.BytesIO(file_data), file_type='stl')
+    
+    # Calculate mesh statistics
+    bounds = mesh.bounds
+    volume = mesh.volume if mesh.is_volume else 0
+    
+    mesh_data = {
+        # Get vertices (unique points)
+        'vertices': mesh.vertices.astype(np.float32),
+        'bounds': bounds.astype(np.float32),
+        'mesh_info': {
+            'vertices': len(mesh.vertices),
+            'faces': len(mesh.faces),
+            'volume': float(volume),
+            'bounds': {
+                'min': bounds[0].tolist(),
+                'max': bounds[1].tolist()
+            }
+        }
+    }
+    
+    return mesh_data
@@ -0,0 +1,97 @@
+# test_backend.py - Tests for the geometric segmentation backend
+import base64
+import io
+import os
+import signal
+import time
+
+import numpy as np
+import pytest
+import trimesh
+
+import backend
+
+def _stl_bytes(subdivisions: int) -> bytes:
+    """Binary STL of an icosphere, different bytes for each subdivision level"""
+    buffer = io.BytesIO()
+    trimesh.creation.icosphere(subdivisions).export(buffer, file_type='stl')
+    return buffer.getvalue()
+
+def _slow_parse(file_data: bytes):
+    """Stand-in for stl_parser.parse_stl that never finishes in time"""
+    time.sleep(60)
+
+def _post_stl(client, file_data: bytes):
+    return client.post('/segment', json={'stl_file': base64.b64encode(file_data).decode()}).get_json()
+
+@pytest.fixture
+def client():
+    backend.segmenter._mesh_cache.clear()
+    yield backend.app.test_client()
+    if backend._pool is not None:
+        backend._discard_pool(backend._pool, terminate=True)
+
+def test_upload_recovers_after_worker_is_killed(client):
+    assert _post_stl(client, _stl_bytes(1))['success']
+    
+    for process in list(backend._pool._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+    
+    result = _post_stl(client, _stl_bytes(2))
+    assert result['success'], result
+    assert result['mesh_info']['vertices'] == 162
+
+def test_timed_out_parse_frees_its_worker(client, monkeypatch):
+    discarded_workers = []
+    discard_pool = backend._discard_pool
+    
+    def spy_discard_pool(pool, terminate=False):
+        discarded_workers.extend(pool._processes.values())
+        discard_pool(pool, terminate)
+    
+    monkeypatch.setattr(backend, '_discard_pool', spy_discard_pool)
+    monkeypatch.setattr(backend, 'STL_PARSE_TIMEOUT', 1)
+    monkeypatch.setattr(backend, 'parse_stl', _slow_parse)
+    
+    result = _post_stl(client, _stl_bytes(1))
+    assert not result['success']
+    assert 'did not finish within' in result['error']
+    
+    assert discarded_workers
+    for process in discarded_workers:
+        process.join(timeout=5)
+        assert not process.is_alive()
+    
+    monkeypatch.undo()
+    result = _post_stl(client, _stl_bytes(2))
+    assert result['success'], result
+
+@pytest.mark.skipif(not backend.HAS_NUMBA, reason='numba not installed')
+@pytest.mark.parametrize('vertices', [
+    np.random.default_rng(0).normal(size=(5000, 3)),
+    np.array([[0, 0, 0], [1, 1, 1], [0.5, np.nan, 0.5], [0.2, 0.5, 0.1]]),
+    np.array([[0, 0, 0], [np.nan, 1, 0], [0.4, 0.6, 0.9], [1, 0.5, 0]]),
+    np.zeros((3, 3)),
+])
+@pytest.mark.parametrize('preset', [None, {
+    'base': {'height_range': (0.0, 0.1)},
+    'body': {'height_range': (0.1, 0.7)},
+    'head': {'height_range': (0.7, 1.0)}
+}])
+def test_numba_and_numpy_classifiers_agree(monkeypatch, vertices, preset):
+    _, numba_bins, numba_counts = backend.segmenter.classify_vertices(vertices, preset)
+    monkeypatch.setattr(backend, 'HAS_NUMBA', False)
+    _, numpy_bins, numpy_counts = backend.segmenter.classify_vertices(vertices, preset)
+    
+    np.testing.assert_array_equal(numba_bins, numpy_bins)
+    np.testing.assert_array_equal(numba_counts, numpy_counts)
+
+@pytest.mark.parametrize('endpoint', ['/segment', '/segment-advanced'])
+def test_non_finite_vertices_are_rejected(client, endpoint):
+    response = client.post(
+        endpoint,
+        data='{"vertices": [[0, 0, 0], [1, 1, 1], [0.5, NaN, 0.5]]}',
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+    assert not response.get_json()['success']